@@ -7,9 +7,9 @@ if (Test-Path "$scriptDir/venv310/Scripts/Activate.ps1") {
     Write-Host "Virtual environment not found. Expected venv310 directory."
 }
 
-$env:PYTHONPATH = Join-Path $scriptDir 'src'
+$env:PYTHONPATH = $scriptDir
 
-python -m gui.main_window
+python -m src.main viewer
 
 Pop-Location
 
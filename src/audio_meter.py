@@ -0,0 +1,165 @@
+"""Audio level metering for NDI sources and audio-follow source selection."""
+
+import time
+
+import numpy as np
+
+SILENCE_DB = -100.0
+
+
+def measure(samples):
+    """Return per-channel ``(rms, peak)`` linear levels of planar audio.
+
+    ``samples`` is a ``(channels, samples)`` float array as delivered in
+    ``AudioFrameV2.data``; a 1-D array is treated as a single channel.
+    """
+    samples = np.asarray(samples, dtype=np.float32)
+    if samples.ndim == 1:
+        samples = samples[np.newaxis, :]
+    count = samples.shape[1]
+    if count == 0:
+        empty = np.zeros(samples.shape[0], dtype=np.float32)
+        return empty, empty
+    # einsum sums the squares without allocating a squared copy of the buffer
+    rms = np.sqrt(np.einsum("ij,ij->i", samples, samples) / count)
+    peak = np.maximum(samples.max(axis=1), -samples.min(axis=1))
+    return rms, peak
+
+
+def to_db(level: float) -> float:
+    """Convert a linear level to dBFS, floored at :data:`SILENCE_DB`."""
+    if level <= 0.0:
+        return SILENCE_DB
+    return max(20.0 * float(np.log10(level)), SILENCE_DB)
+
+
+class AudioMeter:
+    """Rolling audio level history for a set of sources.
+
+    For each source the loudest channel's RMS and peak of the last
+    ``history`` audio frames are kept in a small ``float32`` ring. Sources
+    that have not delivered audio for ``stale_after`` seconds read as silent.
+    """
+
+    def __init__(self, history: int = 32, stale_after: float = 1.0):
+        self.history = history
+        self.stale_after = stale_after
+        self._rings = {}
+        self._counts = {}
+        self._updated = {}
+        self._channels = {}
+
+    def update(self, source: str, samples) -> None:
+        """Meter one audio frame of ``source``."""
+        rms, peak = measure(samples)
+        self._channels[source] = (rms, peak)
+
+        ring = self._rings.get(source)
+        if ring is None:
+            ring = self._rings[source] = np.zeros((self.history, 2), dtype=np.float32)
+            self._counts[source] = 0
+        count = self._counts[source]
+        if rms.size:
+            ring[count % self.history] = (rms.max(), peak.max())
+        else:
+            ring[count % self.history] = 0.0
+        self._counts[source] = count + 1
+        self._updated[source] = time.monotonic()
+
+    def channels(self, source: str):
+        """Return per-channel ``(rms, peak)`` of the latest frame, or ``None``."""
+        return self._channels.get(source)
+
+    def _filled(self, source: str):
+        ring = self._rings.get(source)
+        if ring is None or time.monotonic() - self._updated[source] > self.stale_after:
+            return None
+        return ring[: min(self._counts[source], self.history)]
+
+    def level_db(self, source: str) -> float:
+        """Return the RMS level of ``source`` over its history in dBFS."""
+        filled = self._filled(source)
+        if filled is None:
+            return SILENCE_DB
+        return to_db(float(np.sqrt(np.mean(np.square(filled[:, 0])))))
+
+    def peak_db(self, source: str) -> float:
+        """Return the highest peak of ``source`` over its history in dBFS."""
+        filled = self._filled(source)
+        if filled is None:
+            return SILENCE_DB
+        return to_db(float(filled[:, 1].max()))
+
+    def loudest(self, threshold_db: float = -50.0, sources=None):
+        """Return the source with the highest level above ``threshold_db``.
+
+        Only ``sources`` are considered when given.
+        """
+        best = None
+        best_db = threshold_db
+        for source in self._rings:
+            if sources is not None and source not in sources:
+                continue
+            level = self.level_db(source)
+            if level > best_db:
+                best, best_db = source, level
+        return best
+
+    def forget(self, source: str) -> None:
+        """Drop the history of ``source``."""
+        for table in (self._rings, self._counts, self._updated, self._channels):
+            table.pop(source, None)
+
+
+class AudioFollow:
+    """Select the loudest source of an :class:`AudioMeter`.
+
+    ``on_select`` is called with the new source name when the selection
+    changes; it may switch the displayed source or recall a PTZ preset. Set
+    ``sources`` to restrict the candidates. To avoid flapping, a source only
+    takes over when it is ``margin_db`` louder than the current one and the
+    current one has been held for ``hold`` seconds.
+    """
+
+    def __init__(
+        self,
+        meter: AudioMeter,
+        on_select,
+        threshold_db: float = -50.0,
+        margin_db: float = 6.0,
+        hold: float = 2.0,
+    ):
+        self.meter = meter
+        self.on_select = on_select
+        self.threshold_db = threshold_db
+        self.margin_db = margin_db
+        self.hold = hold
+        self.enabled = False
+        self.sources = None
+        self.current = None
+        self._since = 0.0
+
+    def select(self, source) -> None:
+        """Record a selection made elsewhere, e.g. by the user."""
+        if source != self.current:
+            self.current = source
+            self._since = time.monotonic()
+
+    def update(self):
+        """Re-evaluate the selection; return the newly selected source or ``None``."""
+        if not self.enabled:
+            return None
+        candidate = self.meter.loudest(self.threshold_db, self.sources)
+        if candidate is None or candidate == self.current:
+            return None
+        now = time.monotonic()
+        if self.current is not None:
+            if now - self._since < self.hold:
+                return None
+            gain = self.meter.level_db(candidate) - self.meter.level_db(self.current)
+            if gain < self.margin_db:
+                return None
+        self.current = candidate
+        self._since = now
+        self.on_select(candidate)
+        return candidate
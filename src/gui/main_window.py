@@ -1,23 +1,56 @@
 import sys
 import logging
+import time
 
-import numpy as np
-import cv2
 from PySide6 import QtCore, QtGui, QtWidgets
 
 try:
-    import NDIlib as ndi
-except ImportError:  # pragma: no cover - NDI may not be installed
-    ndi = None
+    from ..ptz_controller import PTZController
+except ImportError:  # run as ``gui.main_window`` with src on the path
+    from ptz_controller import PTZController
+
+# numpy, OpenCV and NDIlib are slow to import; they are loaded by
+# ``_import_backends`` once the window is on screen.
+np = None
+cv2 = None
+ndi = None
 
 logger = logging.getLogger(__name__)
 
+DISCOVERY_INTERVAL_MS = 100
+DISCOVERY_TIMEOUT = 3.0
+
+
+def _import_backends() -> bool:
+    """Import the video backends into this module.
+
+    Returns ``True`` when the NDI bindings are available.
+    """
+    global np, cv2, ndi
+    import numpy as np
+    import cv2
+
+    try:
+        import NDIlib as ndi
+    except ImportError:  # pragma: no cover - NDI may not be installed
+        ndi = None
+    return ndi is not None
+
 
 class MainWindow(QtWidgets.QMainWindow):
-    """Main application window for viewing NDI sources."""
+    """Main application window for viewing NDI sources.
+
+    Audio follow switches the displayed source to the loudest one. With
+    ``follow_mode="preset"`` it instead recalls a PTZ preset: ``presets`` maps
+    an NDI source name to the ``(ip, port, preset)`` to recall when that
+    source is loudest.
+    """
 
-    def __init__(self):
+    def __init__(self, presets=None, follow_mode: str = "source"):
         super().__init__()
+        self.presets = dict(presets or {})
+        self.follow_mode = follow_mode
+        self._ptz_controllers = {}  # keyed by (ip, port)
         self.setWindowTitle("IntelliTrack NDI Viewer")
 
         central = QtWidgets.QWidget()
@@ -27,10 +60,15 @@ class MainWindow(QtWidgets.QMainWindow):
         self.source_combo = QtWidgets.QComboBox()
         self.video_label = QtWidgets.QLabel(alignment=QtCore.Qt.AlignCenter)
         self.video_label.setMinimumSize(320, 240)
+        self.video_label.setText("Starting NDI...")
+        self.follow_check = QtWidgets.QCheckBox("Follow audio")
+        self.level_label = QtWidgets.QLabel()
 
         left_layout = QtWidgets.QVBoxLayout()
         left_layout.addWidget(self.refresh_btn)
         left_layout.addWidget(self.source_combo)
+        left_layout.addWidget(self.follow_check)
+        left_layout.addWidget(self.level_label)
         left_layout.addStretch(1)
 
         main_layout = QtWidgets.QHBoxLayout(central)
@@ -39,24 +77,58 @@ class MainWindow(QtWidgets.QMainWindow):
 
         self.timer = QtCore.QTimer(self)
         self.timer.timeout.connect(self._update_frame)
+        self.discovery_timer = QtCore.QTimer(self)
+        self.discovery_timer.timeout.connect(self._poll_sources)
         self.refresh_btn.clicked.connect(self._refresh_sources)
         self.source_combo.currentIndexChanged.connect(self._connect_source)
+        self.follow_check.toggled.connect(self._set_audio_follow)
 
         self.finder = None
+        self._discovery_deadline = 0.0
         self.receiver = None
         self.sources = []
+        self.current_source = None
+        self.audio_meter = None
+        self.audio_follow = None
+        self._audio_receivers = {}  # audio-only receivers keyed by NDI name
         self._last_qimage = None  # prevent QImage from being garbage collected
 
-        if ndi is not None and ndi.initialize():
+    def init_ndi(self) -> None:
+        """Import the video backends and start NDI discovery.
+
+        Called once the window is visible so that slow imports and NDI
+        start-up do not delay the first paint.
+        """
+        ndi_available = _import_backends()
+        try:
+            from ..audio_meter import AudioFollow, AudioMeter
+        except ImportError:  # run as ``gui.main_window`` with src on the path
+            from audio_meter import AudioFollow, AudioMeter
+
+        self.audio_meter = AudioMeter()
+        self.audio_follow = AudioFollow(self.audio_meter, self._on_audio_select)
+        self.audio_follow.enabled = self.follow_check.isChecked()
+        if self.follow_mode == "preset":
+            self.audio_follow.sources = set(self.presets)
+        if ndi_available and ndi.initialize():
+            self.video_label.setText("Searching for NDI sources...")
             self._refresh_sources()
         else:
             self.source_combo.addItem("ndi-python not available")
+            self.video_label.setText("NDI not available")
 
         self.timer.start(30)
 
     # ------------------------------------------------------------------
     def closeEvent(self, event):
         self.timer.stop()
+        self.discovery_timer.stop()
+        for receiver in self._audio_receivers.values():
+            ndi.recv_destroy(receiver)
+        self._audio_receivers.clear()
+        for ptz in self._ptz_controllers.values():
+            ptz.close()
+        self._ptz_controllers.clear()
         if self.receiver is not None:
             ndi.recv_destroy(self.receiver)
             self.receiver = None
@@ -69,7 +141,11 @@ class MainWindow(QtWidgets.QMainWindow):
 
     # ------------------------------------------------------------------
     def _refresh_sources(self):
-        """Discover NDI sources on the local network."""
+        """Discover NDI sources on the local network.
+
+        The finder is polled from ``discovery_timer`` for
+        ``DISCOVERY_TIMEOUT`` seconds instead of blocking the GUI thread.
+        """
         if ndi is None:
             return
 
@@ -79,23 +155,50 @@ class MainWindow(QtWidgets.QMainWindow):
                 QtWidgets.QMessageBox.critical(self, "Error", "Failed to create NDI finder")
                 return
 
-        ndi.find_wait_for_sources(self.finder, 1000)
-        self.sources = list(ndi.find_get_current_sources(self.finder))
+        self._discovery_deadline = time.monotonic() + DISCOVERY_TIMEOUT
+        self.discovery_timer.start(DISCOVERY_INTERVAL_MS)
+        self._poll_sources()
+
+    def _poll_sources(self):
+        sources = list(ndi.find_get_current_sources(self.finder))
+        if [src.ndi_name for src in sources] != [src.ndi_name for src in self.sources]:
+            self._set_sources(sources)
 
+        if time.monotonic() >= self._discovery_deadline:
+            self.discovery_timer.stop()
+            if not self.sources:
+                self.video_label.setText("No NDI sources found")
+
+    def _set_sources(self, sources):
+        """Show ``sources`` in the combo box, keeping the current one selected."""
+        current = self.current_source.ndi_name if self.current_source else None
+        self.sources = sources
+
+        index = 0
         self.source_combo.blockSignals(True)
         self.source_combo.clear()
-        for src in self.sources:
+        for i, src in enumerate(self.sources):
             name = src.ndi_name
             ip = src.url_address or ""
             display = f"{name} ({ip})" if ip else name
             self.source_combo.addItem(display)
+            if name == current:
+                index = i
+        self.source_combo.setCurrentIndex(index)
         self.source_combo.blockSignals(False)
 
         if not self.sources:
-            self.video_label.setText("No NDI sources found")
+            if self.discovery_timer.isActive():
+                self.video_label.setText("Searching for NDI sources...")
+            else:
+                self.video_label.setText("No NDI sources found")
             self._disconnect_receiver()
+            self.current_source = None
+            self._sync_audio_receivers()
+        elif self.sources[index].ndi_name != current:
+            self._connect_source(index)
         else:
-            self._connect_source(self.source_combo.currentIndex())
+            self._sync_audio_receivers()
 
     def _disconnect_receiver(self):
         if self.receiver is not None:
@@ -117,6 +220,97 @@ class MainWindow(QtWidgets.QMainWindow):
             QtWidgets.QMessageBox.critical(self, "Error", "Failed to create NDI receiver")
             return
         ndi.recv_connect(self.receiver, source)
+        self.current_source = source
+        if self.follow_mode == "source":
+            self.audio_follow.select(source.ndi_name)
+        self._sync_audio_receivers()
+
+    # ------------------------------------------------------------------
+    def _set_audio_follow(self, enabled: bool) -> None:
+        if self.audio_follow is None:
+            return
+        self.audio_follow.enabled = enabled
+        self._sync_audio_receivers()
+
+    def _on_audio_select(self, name: str) -> None:
+        if self.follow_mode != "preset":
+            self._select_source_by_name(name)
+            return
+        ip, port, preset = self.presets[name]
+        ptz = self._ptz_controllers.get((ip, port))
+        if ptz is None:
+            ptz = self._ptz_controllers[(ip, port)] = PTZController(ip, port)
+        logger.info("Audio follow recalling preset %s on %s for %s", preset, ip, name)
+        ptz.recall_preset(preset)
+
+    def _select_source_by_name(self, name: str) -> None:
+        for index, src in enumerate(self.sources):
+            if src.ndi_name == name:
+                logger.info("Audio follow switching to %s", name)
+                self.source_combo.setCurrentIndex(index)
+                return
+
+    def _sync_audio_receivers(self) -> None:
+        """Keep an audio-only receiver on every follow candidate not displayed.
+
+        The displayed source is metered from the main receiver; the others
+        are only needed while audio follow is enabled. In preset mode only
+        the sources mapped to a preset are candidates.
+        """
+        if ndi is None:
+            return
+        wanted = {}
+        if self.follow_check.isChecked():
+            current = self.current_source.ndi_name if self.current_source else None
+            wanted = {
+                src.ndi_name: src
+                for src in self.sources
+                if src.ndi_name != current
+                and (self.follow_mode != "preset" or src.ndi_name in self.presets)
+            }
+
+        for name in list(self._audio_receivers):
+            if name not in wanted:
+                ndi.recv_destroy(self._audio_receivers.pop(name))
+        for name, src in wanted.items():
+            if name in self._audio_receivers:
+                continue
+            create_desc = ndi.RecvCreateV3()
+            create_desc.bandwidth = ndi.RECV_BANDWIDTH_AUDIO_ONLY
+            receiver = ndi.recv_create_v3(create_desc)
+            if receiver is None:
+                logger.error("Failed to create audio receiver for %s", name)
+                continue
+            ndi.recv_connect(receiver, src)
+            self._audio_receivers[name] = receiver
+
+    def _poll_audio(self) -> None:
+        """Meter pending audio of the background receivers and apply audio follow."""
+        for name, receiver in self._audio_receivers.items():
+            # bounded so a chatty source cannot starve the video path
+            for _ in range(16):
+                frame_type, video_frame, audio_frame, metadata_frame = ndi.recv_capture_v2(
+                    receiver, 0
+                )
+                if frame_type == ndi.FRAME_TYPE_AUDIO:
+                    try:
+                        self.audio_meter.update(name, audio_frame.data)
+                    except Exception:
+                        logger.exception("Failed to meter audio frame")
+                    finally:
+                        ndi.recv_free_audio_v2(receiver, audio_frame)
+                elif frame_type == ndi.FRAME_TYPE_VIDEO:
+                    ndi.recv_free_video_v2(receiver, video_frame)
+                elif frame_type == ndi.FRAME_TYPE_METADATA:
+                    ndi.recv_free_metadata(receiver, metadata_frame)
+                elif frame_type == ndi.FRAME_TYPE_NONE:
+                    break
+
+        if self.current_source is not None:
+            self.level_label.setText(
+                "Audio {:.0f} dBFS".format(self.audio_meter.level_db(self.current_source.ndi_name))
+            )
+        self.audio_follow.update()
 
     # ------------------------------------------------------------------
     def _display_qimage(self, qimg: QtGui.QImage) -> None:
@@ -238,7 +432,14 @@ class MainWindow(QtWidgets.QMainWindow):
                         break
                     elif frame_type == ndi.FRAME_TYPE_AUDIO:
                         logger.info("Received audio frame")
-                        ndi.recv_free_audio_v2(self.receiver, audio_frame)
+                        try:
+                            self.audio_meter.update(
+                                self.current_source.ndi_name, audio_frame.data
+                            )
+                        except Exception:
+                            logger.exception("Failed to meter audio frame")
+                        finally:
+                            ndi.recv_free_audio_v2(self.receiver, audio_frame)
                         continue
                     elif frame_type == ndi.FRAME_TYPE_METADATA:
                         ndi.recv_free_metadata(self.receiver, metadata_frame)
@@ -255,6 +456,8 @@ class MainWindow(QtWidgets.QMainWindow):
                 except Exception:
                     logger.exception("Exception during video frame handling")
                     break
+
+            self._poll_audio()
         except Exception as e:
             logger.exception("[FATAL ERROR] Exception in _update_frame: %s", e)
 
@@ -265,6 +468,7 @@ def main():
     window = MainWindow()
     window.resize(800, 600)
     window.show()
+    QtCore.QTimer.singleShot(0, window.init_ndi)
     sys.exit(app.exec())
 
 
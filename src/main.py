@@ -1,19 +1,191 @@
+"""Single entry point for the IntelliTrack tools.
+
+Only the standard library is imported up front; numpy, OpenCV, Qt and NDIlib
+are imported by the subcommand that needs them so that each path starts as
+quickly as possible. Run from the project root with::
+
+    python -m src.main viewer
+"""
+
+import argparse
+import importlib
+import logging
+import os
+import subprocess
 import sys
+import time
+
+from .ptz_controller import parse_preset
+
+_START = time.perf_counter()
+
+logger = logging.getLogger(__name__)
+
+BENCH_MODULES = ("numpy", "cv2", "PySide6.QtWidgets", "NDIlib")
+
 
-from PyQt5.QtWidgets import QApplication, QLabel, QWidget, QVBoxLayout
+class StartupTimer:
+    """Record how long each start-up phase takes."""
 
+    def __init__(self, start: float = _START):
+        self._last = start
+        self._start = start
+        self.phases = []
 
-def main():
-    app = QApplication(sys.argv)
-    window = QWidget()
-    window.setWindowTitle("IntelliTrack")
-    layout = QVBoxLayout()
-    label = QLabel("Hello, IntelliTrack!")
-    layout.addWidget(label)
-    window.setLayout(layout)
+    def mark(self, label: str) -> None:
+        """Close the current phase under ``label``."""
+        now = time.perf_counter()
+        self.phases.append((label, now - self._last))
+        self._last = now
+
+    def report(self) -> None:
+        total = self._last - self._start
+        logger.info("Startup took %.0f ms", total * 1000)
+        for label, duration in self.phases:
+            logger.info("  %-24s %7.1f ms", label, duration * 1000)
+
+
+def _run_viewer(args, timer):
+    from PySide6 import QtCore, QtWidgets
+
+    timer.mark("import PySide6")
+    from .gui.main_window import MainWindow
+
+    timer.mark("import main window")
+
+    app = QtWidgets.QApplication(sys.argv[:1])
+    window = MainWindow(dict(args.preset), args.follow)
+    window.resize(800, 600)
     window.show()
-    sys.exit(app.exec_())
+    app.processEvents()
+    timer.mark("window shown")
+
+    def _start_ndi():
+        # pre-import each backend here only to attribute its cost in the report
+        for module in ("numpy", "cv2", "NDIlib"):
+            try:
+                importlib.import_module(module)
+            except ImportError:
+                pass
+            timer.mark(f"import {module}")
+        # discovery continues on a timer, so this covers start-up work only
+        window.init_ndi()
+        timer.mark("NDI initialised")
+        timer.report()
+
+    QtCore.QTimer.singleShot(0, _start_ndi)
+    return app.exec()
+
+
+def _run_tracker(args, timer):
+    from .video_tracker import VideoTracker
+
+    timer.mark("import tracker")
+    source = int(args.source) if args.source.isdigit() else args.source
+    tracker = VideoTracker(source, args.ptz_ip, args.ptz_port)
+    timer.mark("tracker ready")
+    timer.report()
+    tracker.run()
+    return 0
+
+
+def _run_headless(args, timer):
+    from .multi_camera import CameraConfig, run
+
+    timer.mark("import multi_camera")
+    try:
+        cameras = [CameraConfig.parse(spec) for spec in args.camera]
+    except ValueError as exc:
+        logger.error("%s", exc)
+        return 2
+    timer.report()
+    run(cameras, headless=True)
+    return 0
+
+
+def _run_bench(args, timer):
+    """Time cold imports of the heavy modules and of this launcher.
+
+    Every measurement runs in a fresh interpreter so that nothing is cached;
+    the best of ``args.repeat`` runs is reported.
+    """
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    code = (
+        "import importlib, sys, time\n"
+        "t = time.perf_counter()\n"
+        "importlib.import_module(sys.argv[1])\n"
+        "print(time.perf_counter() - t)\n"
+    )
+    print(f"{'module':<24} {'import ms':>10}")
+    for module in BENCH_MODULES + ("src.main",):
+        best = None
+        for _ in range(args.repeat):
+            result = subprocess.run(
+                [sys.executable, "-c", code, module],
+                capture_output=True,
+                text=True,
+                cwd=root,
+            )
+            if result.returncode != 0:
+                break
+            elapsed = float(result.stdout.strip().splitlines()[-1])
+            best = elapsed if best is None else min(best, elapsed)
+        if best is None:
+            print(f"{module:<24} {'missing':>10}")
+        else:
+            print(f"{module:<24} {best * 1000:>10.1f}")
+    return 0
+
+
+def main(argv=None):
+    timer = StartupTimer()
+    parser = argparse.ArgumentParser(prog="intellitrack", description=__doc__.splitlines()[0])
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    viewer = sub.add_parser("viewer", help="browse NDI sources")
+    viewer.add_argument(
+        "--follow",
+        choices=("source", "preset"),
+        default="source",
+        help="what audio follow switches: the displayed source or a PTZ preset",
+    )
+    viewer.add_argument(
+        "--preset",
+        action="append",
+        default=[],
+        type=parse_preset,
+        metavar="SOURCE=PTZ_IP[:PORT]/PRESET",
+        help="recall PRESET on this PTZ when NDI source SOURCE is loudest; repeatable",
+    )
+    viewer.set_defaults(func=_run_viewer)
+
+    tracker = sub.add_parser("tracker", help="track an object with one PTZ camera")
+    tracker.add_argument("--source", default="0", help="capture device index or URL")
+    tracker.add_argument("--ptz-ip", default="127.0.0.1")
+    tracker.add_argument("--ptz-port", type=int, default=52381)
+    tracker.set_defaults(func=_run_tracker)
+
+    headless = sub.add_parser("headless", help="track several cameras without a GUI")
+    headless.add_argument(
+        "--camera",
+        action="append",
+        required=True,
+        metavar="NAME=SOURCE[,PTZ_IP[:PORT]]",
+        help="camera to track; repeat for each camera",
+    )
+    headless.set_defaults(func=_run_headless)
+
+    bench = sub.add_parser("bench", help="measure cold import times")
+    bench.add_argument("--repeat", type=int, default=3)
+    bench.set_defaults(func=_run_bench)
+
+    args = parser.parse_args(argv)
+    if args.command == "viewer" and args.follow == "preset" and not args.preset:
+        parser.error("--follow preset needs at least one --preset")
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
+    timer.mark("launcher")
+    return args.func(args, timer)
 
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
@@ -0,0 +1,611 @@
+"""Track several PTZ cameras from a single orchestrator process.
+
+Each camera gets a capture thread in the orchestrator and a tracker worker
+process. Frames travel from capture to worker through a shared-memory ring
+buffer, so they are never pickled; only small control and status messages go
+through queues. Workers are pinned round-robin to the available cores (on
+Windows this needs ``psutil``) and restarted when they exit or stop reporting.
+"""
+
+import argparse
+import logging
+import math
+import multiprocessing as mp
+import os
+import queue
+import threading
+import time
+from multiprocessing import shared_memory
+
+import cv2
+import numpy as np
+
+from .ptz_controller import PTZController
+
+try:
+    import psutil
+except ImportError:  # pragma: no cover - only needed for CPU pinning on Windows
+    psutil = None
+
+logger = logging.getLogger(__name__)
+
+_CAN_PIN = hasattr(os, "sched_setaffinity") or (
+    psutil is not None and hasattr(psutil.Process, "cpu_affinity")
+)
+
+# psutil.Error is not an OSError
+_PIN_ERRORS = (OSError,) if psutil is None else (OSError, psutil.Error)
+
+
+def _available_cpus():
+    if hasattr(os, "sched_getaffinity"):
+        return sorted(os.sched_getaffinity(0))
+    if _CAN_PIN:
+        return sorted(psutil.Process().cpu_affinity())
+    return list(range(os.cpu_count() or 1))
+
+
+def _pin_to_cpu(cpu: int) -> bool:
+    """Restrict the current process to ``cpu``; return ``False`` if that failed."""
+    try:
+        if hasattr(os, "sched_setaffinity"):
+            os.sched_setaffinity(0, {cpu})
+            return True
+        if _CAN_PIN:
+            psutil.Process().cpu_affinity([cpu])
+            return True
+    except _PIN_ERRORS:
+        pass
+    return False
+
+
+class FrameRing:
+    """Ring of BGR frames stored in a shared memory block.
+
+    The block starts with an ``int64`` header: the sequence number of the last
+    written frame followed by ``(seq, height, width)`` for every slot. A slot's
+    ``seq`` is set to ``-1`` while it is being written, which lets readers in
+    other processes detect and drop torn frames without any locking.
+    """
+
+    _SLOT_FIELDS = 3
+
+    def __init__(self, width: int, height: int, slots: int = 3, name: str = None):
+        self.width = width
+        self.height = height
+        self.slots = slots
+        self.slot_bytes = width * height * 3
+        header_len = 1 + self._SLOT_FIELDS * slots
+        header_bytes = header_len * 8
+
+        self._owner = name is None
+        if self._owner:
+            self.shm = shared_memory.SharedMemory(
+                create=True, size=header_bytes + self.slot_bytes * slots
+            )
+        else:
+            self.shm = shared_memory.SharedMemory(name=name)
+        self.name = self.shm.name
+
+        self._header = np.ndarray((header_len,), dtype=np.int64, buffer=self.shm.buf)
+        self._data = np.ndarray(
+            (slots, self.slot_bytes), dtype=np.uint8, buffer=self.shm.buf, offset=header_bytes
+        )
+        if self._owner:
+            self._header[:] = 0
+
+    def write(self, frame: np.ndarray) -> int:
+        """Copy ``frame`` into the next slot and return its sequence number.
+
+        Frames larger than the ring's geometry are scaled down to fit.
+        """
+        h, w = frame.shape[:2]
+        if h * w * 3 > self.slot_bytes:
+            frame = cv2.resize(frame, (self.width, self.height), interpolation=cv2.INTER_AREA)
+            h, w = self.height, self.width
+
+        seq = int(self._header[0]) + 1
+        slot = seq % self.slots
+        base = 1 + self._SLOT_FIELDS * slot
+        self._header[base] = -1
+        self._data[slot, : h * w * 3] = np.ascontiguousarray(frame).reshape(-1)
+        self._header[base + 1] = h
+        self._header[base + 2] = w
+        self._header[base] = seq
+        self._header[0] = seq
+        return seq
+
+    def read(self, last_seq: int = 0):
+        """Return ``(seq, frame)`` for the newest frame after ``last_seq``.
+
+        ``frame`` is a private copy, or ``None`` when no new complete frame is
+        available, in which case ``last_seq`` is returned unchanged.
+        """
+        seq = int(self._header[0])
+        if seq == 0 or seq == last_seq:
+            return last_seq, None
+
+        base = 1 + self._SLOT_FIELDS * (seq % self.slots)
+        if self._header[base] != seq:
+            return last_seq, None
+        h = int(self._header[base + 1])
+        w = int(self._header[base + 2])
+        frame = self._data[seq % self.slots, : h * w * 3].reshape(h, w, 3).copy()
+        if self._header[base] != seq:  # overwritten while copying
+            return last_seq, None
+        return seq, frame
+
+    def close(self) -> None:
+        """Detach from the block, removing it if this instance created it."""
+        # numpy views must be released before the mapping can be closed
+        self._header = None
+        self._data = None
+        self.shm.close()
+        if self._owner:
+            self.shm.unlink()
+
+
+class CameraConfig:
+    """Settings for one camera handled by :class:`MultiCameraOrchestrator`."""
+
+    def __init__(
+        self,
+        name: str,
+        source=0,
+        ptz_ip: str = "127.0.0.1",
+        ptz_port: int = 52381,
+        width: int = 1280,
+        height: int = 720,
+        slots: int = 3,
+    ):
+        self.name = name
+        self.source = source
+        self.ptz_ip = ptz_ip
+        self.ptz_port = ptz_port
+        self.width = width
+        self.height = height
+        self.slots = slots
+
+    @classmethod
+    def parse(cls, spec: str) -> "CameraConfig":
+        """Build a config from ``NAME=SOURCE[,PTZ_IP[:PORT]]``.
+
+        ``SOURCE`` is a capture device index or any URL/path accepted by
+        ``cv2.VideoCapture``.
+        """
+        name, sep, rest = spec.partition("=")
+        if not sep or not name:
+            raise ValueError(f"Invalid camera spec: {spec!r}")
+        source, _, ptz = rest.partition(",")
+        config = cls(name, int(source) if source.isdigit() else source)
+        if ptz:
+            ip, _, port = ptz.partition(":")
+            config.ptz_ip = ip
+            if port:
+                config.ptz_port = int(port)
+        return config
+
+
+class _CaptureThread(threading.Thread):
+    """Read frames from one camera into its :class:`FrameRing`."""
+
+    def __init__(self, config: CameraConfig, ring: FrameRing):
+        super().__init__(name=f"capture-{config.name}", daemon=True)
+        self.config = config
+        self.ring = ring
+        self.frames = 0
+        self._stop_event = threading.Event()
+
+    def stop(self) -> None:
+        self._stop_event.set()
+
+    def _open(self):
+        cap = cv2.VideoCapture(self.config.source)
+        cap.set(cv2.CAP_PROP_FRAME_WIDTH, self.config.width)
+        cap.set(cv2.CAP_PROP_FRAME_HEIGHT, self.config.height)
+        return cap
+
+    def run(self):
+        cap = self._open()
+        try:
+            while not self._stop_event.is_set():
+                ret, frame = cap.read()
+                if not ret:
+                    if not cap.isOpened():
+                        logger.warning("Capture for %s lost, reopening", self.config.name)
+                        cap.release()
+                        self._stop_event.wait(1.0)
+                        cap = self._open()
+                    else:
+                        self._stop_event.wait(0.01)
+                    continue
+                self.ring.write(frame)
+                self.frames += 1
+        finally:
+            cap.release()
+
+
+def _tracker_worker(config, ring_name, commands, status, cpu=None):
+    """Worker process: track the ROI in ``config``'s frames and steer its PTZ.
+
+    Commands arrive as ``(command, argument)`` tuples: ``("roi", (roi_id,
+    bbox))`` to (re)initialise the tracker (a ``None`` bbox clears it),
+    ``("tracking", bool)`` to enable PTZ following and ``("stop", None)`` to
+    exit. A status dict is posted roughly once per second and doubles as the
+    worker's heartbeat; its ``roi_id`` tells which ROI the ``bbox`` follows.
+    """
+    if cpu is not None and not _pin_to_cpu(cpu):
+        logger.warning("Could not pin tracker %s to CPU %s", config.name, cpu)
+
+    ring = FrameRing(config.width, config.height, config.slots, name=ring_name)
+    ptz = PTZController(config.ptz_ip, config.ptz_port)
+    tracker = None
+    pending_roi = None
+    pending_id = roi_id = 0
+    bbox = None
+    tracking = False
+    moving = False  # a pan/tilt drive is active until a stop is sent
+    last_seq = 0
+    frames = 0
+    last_report = time.monotonic()
+    try:
+        while True:
+            try:
+                while True:
+                    cmd, arg = commands.get_nowait()
+                    if cmd == "stop":
+                        return
+                    if cmd == "roi":
+                        pending_id, box = arg
+                        if box is None:
+                            tracker = pending_roi = bbox = None
+                            roi_id = pending_id
+                            ptz.pan_tilt(0, 0)
+                            moving = False
+                        else:
+                            pending_roi = tuple(int(v) for v in box)
+                    elif cmd == "tracking":
+                        tracking = bool(arg)
+                        if not tracking:
+                            ptz.pan_tilt(0, 0)
+                            moving = False
+            except queue.Empty:
+                pass
+
+            last_seq, frame = ring.read(last_seq)
+            if frame is None:
+                time.sleep(0.002)
+            else:
+                frames += 1
+                if pending_roi is not None:
+                    tracker = cv2.TrackerCSRT_create()
+                    tracker.init(frame, pending_roi)
+                    bbox, pending_roi = pending_roi, None
+                    roi_id = pending_id
+                elif tracker is not None:
+                    success, box = tracker.update(frame)
+                    bbox = tuple(int(v) for v in box) if success else None
+                    if success and tracking:
+                        x, y, w, h = bbox
+                        ptz.follow(x + w / 2, y + h / 2, frame.shape[1], frame.shape[0])
+                        moving = True
+                    elif moving:
+                        ptz.pan_tilt(0, 0)
+                        moving = False
+
+            now = time.monotonic()
+            if now - last_report >= 1.0:
+                status.put(
+                    (
+                        config.name,
+                        {
+                            "pid": os.getpid(),
+                            "fps": frames / (now - last_report),
+                            "tracking": tracking,
+                            "bbox": bbox,
+                            "roi_id": roi_id,
+                        },
+                    )
+                )
+                frames = 0
+                last_report = now
+    finally:
+        ptz.pan_tilt(0, 0)
+        ptz.close()
+        ring.close()
+
+
+class MultiCameraOrchestrator:
+    """Run capture and tracking for several cameras behind one control surface.
+
+    Call :meth:`start`, then :meth:`poll` periodically to collect worker status
+    and restart workers that died or stopped reporting for
+    ``heartbeat_timeout`` seconds. A restarted worker resumes from the last
+    box its predecessor reported for the current ROI. If the ROI was set after
+    that report, it is replayed as drawn; if the worker never reported a box,
+    it starts with no ROI and tracking off, since the subject will have moved
+    away from the drawn ROI.
+    """
+
+    def __init__(self, cameras, restart_delay: float = 1.0, heartbeat_timeout: float = 5.0):
+        self.cameras = {config.name: config for config in cameras}
+        self.restart_delay = restart_delay
+        self.heartbeat_timeout = heartbeat_timeout
+
+        self._ctx = mp.get_context("spawn")
+        self._rings = {}
+        self._captures = {}
+        self._workers = {}
+        self._commands = {}
+        # one status queue per worker: terminating a worker can corrupt a queue
+        # it was writing to, which must not stall the other workers' heartbeats
+        self._status_queues = {}
+        self._last_seen = {}
+        self._died_at = {}
+        self._preview_seq = {}
+        self._status = {name: {} for name in self.cameras}
+        self._restarts = {name: 0 for name in self.cameras}
+        self._state = {
+            name: {"roi": None, "roi_id": 0, "tracking": False} for name in self.cameras
+        }
+
+        self._cpus = _available_cpus()
+        if not _CAN_PIN:
+            logger.warning(
+                "CPU pinning is unavailable (install psutil on Windows); "
+                "tracker workers are left to the OS scheduler"
+            )
+
+    # ------------------------------------------------------------------
+    def start(self) -> None:
+        for name, config in self.cameras.items():
+            ring = FrameRing(config.width, config.height, config.slots)
+            self._rings[name] = ring
+            self._preview_seq[name] = 0
+            capture = _CaptureThread(config, ring)
+            capture.start()
+            self._captures[name] = capture
+            self._start_worker(name)
+
+    def stop(self) -> None:
+        for name, commands in self._commands.items():
+            if self._workers[name].is_alive():
+                commands.put(("stop", None))
+        for name, proc in self._workers.items():
+            proc.join(timeout=2.0)
+            if proc.is_alive():
+                proc.terminate()
+                proc.join()
+                self._stop_ptz(name)
+        for capture in self._captures.values():
+            capture.stop()
+        for capture in self._captures.values():
+            capture.join(timeout=2.0)
+        for ring in self._rings.values():
+            ring.close()
+        self._workers.clear()
+        self._commands.clear()
+        self._status_queues.clear()
+        self._captures.clear()
+        self._rings.clear()
+
+    def _stop_ptz(self, name: str) -> None:
+        """Halt the PTZ of ``name`` on behalf of a worker that cannot."""
+        config = self.cameras[name]
+        ptz = PTZController(config.ptz_ip, config.ptz_port)
+        ptz.pan_tilt(0, 0)
+        ptz.close()
+
+    def _start_worker(self, name: str, restart: bool = False) -> None:
+        config = self.cameras[name]
+        index = list(self.cameras).index(name)
+        commands = self._ctx.Queue()
+        status = self._ctx.Queue()
+        proc = self._ctx.Process(
+            target=_tracker_worker,
+            args=(
+                config,
+                self._rings[name].name,
+                commands,
+                status,
+                self._cpus[index % len(self._cpus)] if _CAN_PIN else None,
+            ),
+            name=f"tracker-{name}",
+            daemon=True,
+        )
+        proc.start()
+        self._workers[name] = proc
+        self._commands[name] = commands
+        self._status_queues[name] = status
+        self._last_seen[name] = time.monotonic()
+        self._died_at.pop(name, None)
+
+        state = self._state[name]
+        if restart:
+            reported = self._status[name]
+            # a report about an older ROI must not replace one set since
+            if reported.get("roi_id") == state["roi_id"]:
+                state["roi"] = reported.get("bbox")
+            if state["roi"] is None:
+                state["tracking"] = False
+            self._status[name] = {}
+        if state["roi"] is not None:
+            commands.put(("roi", (state["roi_id"], state["roi"])))
+        commands.put(("tracking", state["tracking"]))
+
+    # ------------------------------------------------------------------
+    def select_roi(self, name: str, bbox) -> None:
+        """Start tracking ``bbox`` (``x, y, w, h``) on camera ``name``."""
+        state = self._state[name]
+        state["roi"] = bbox
+        state["roi_id"] += 1
+        self._commands[name].put(("roi", (state["roi_id"], bbox)))
+
+    def set_tracking(self, name: str, enabled: bool) -> None:
+        """Enable or disable PTZ following on camera ``name``."""
+        self._state[name]["tracking"] = bool(enabled)
+        self._commands[name].put(("tracking", bool(enabled)))
+
+    def latest_frame(self, name: str):
+        """Return the newest captured frame of ``name`` or ``None``."""
+        seq, frame = self._rings[name].read(self._preview_seq[name])
+        self._preview_seq[name] = seq
+        return frame
+
+    def status(self) -> dict:
+        """Return a snapshot of every camera's capture and worker state."""
+        snapshot = {}
+        for name in self.cameras:
+            proc = self._workers.get(name)
+            capture = self._captures.get(name)
+            entry = dict(self._status[name])
+            entry["tracking"] = self._state[name]["tracking"]
+            entry["alive"] = proc is not None and proc.is_alive()
+            entry["restarts"] = self._restarts[name]
+            entry["captured"] = capture.frames if capture is not None else 0
+            snapshot[name] = entry
+        return snapshot
+
+    def poll(self) -> None:
+        """Collect worker status and restart failed workers."""
+        for name, status in self._status_queues.items():
+            while True:
+                try:
+                    _, info = status.get_nowait()
+                except queue.Empty:
+                    break
+                self._status[name] = info
+                self._last_seen[name] = time.monotonic()
+
+        now = time.monotonic()
+        for name, proc in list(self._workers.items()):
+            if proc.is_alive() and now - self._last_seen[name] > self.heartbeat_timeout:
+                logger.warning("Tracker %s stopped reporting, terminating", name)
+                proc.terminate()
+                proc.join(timeout=1.0)
+            if proc.is_alive():
+                continue
+            if name not in self._died_at:
+                # a crashed or terminated worker never sent its own stop
+                self._stop_ptz(name)
+            died_at = self._died_at.setdefault(name, now)
+            if now - died_at < self.restart_delay:
+                continue
+            logger.warning("Tracker %s exited with code %s, restarting", name, proc.exitcode)
+            self._restarts[name] += 1
+            self._start_worker(name, restart=True)
+
+
+def _mosaic(orchestrator, frames, tile_w=480, tile_h=270):
+    """Tile the latest frame of each camera into one image with a status line."""
+    names = list(orchestrator.cameras)
+    cols = math.ceil(math.sqrt(len(names)))
+    rows = math.ceil(len(names) / cols)
+    canvas = np.zeros((rows * tile_h, cols * tile_w, 3), dtype=np.uint8)
+    status = orchestrator.status()
+    for i, name in enumerate(names):
+        frame = frames.get(name)
+        y, x = (i // cols) * tile_h, (i % cols) * tile_w
+        if frame is not None:
+            sx = tile_w / frame.shape[1]
+            sy = tile_h / frame.shape[0]
+            canvas[y : y + tile_h, x : x + tile_w] = cv2.resize(frame, (tile_w, tile_h))
+            bbox = status[name].get("bbox")
+            if bbox:
+                bx, by, bw, bh = bbox
+                cv2.rectangle(
+                    canvas,
+                    (x + int(bx * sx), y + int(by * sy)),
+                    (x + int((bx + bw) * sx), y + int((by + bh) * sy)),
+                    (0, 255, 0),
+                    2,
+                )
+        info = status[name]
+        text = "{} {} {:.0f}fps {}".format(
+            i + 1,
+            name,
+            info.get("fps", 0.0),
+            "TRACK" if info.get("tracking") else "idle",
+        )
+        if not info["alive"]:
+            text += " DOWN"
+        cv2.putText(canvas, text, (x + 8, y + 24), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 255, 255), 2)
+    return canvas
+
+
+def run(cameras, headless: bool = False) -> None:
+    """Track ``cameras`` until the user quits or the process is interrupted.
+
+    With ``headless`` the status of every camera is logged periodically
+    instead of being shown in a preview window.
+    """
+    orchestrator = MultiCameraOrchestrator(cameras)
+    orchestrator.start()
+    names = list(orchestrator.cameras)
+    frames = {}
+    selected = names[0]
+    last_log = time.monotonic()
+    try:
+        while True:
+            orchestrator.poll()
+            if headless:
+                time.sleep(0.1)
+                if time.monotonic() - last_log >= 5.0:
+                    for name, info in orchestrator.status().items():
+                        logger.info("%s: %s", name, info)
+                    last_log = time.monotonic()
+                continue
+
+            for name in names:
+                frame = orchestrator.latest_frame(name)
+                if frame is not None:
+                    frames[name] = frame
+            cv2.imshow("IntelliTrack", _mosaic(orchestrator, frames))
+            # 1-9 select a camera, r picks its ROI, t toggles tracking, q quits
+            key = cv2.waitKey(30) & 0xFF
+            if key == ord("q"):
+                break
+            if ord("1") <= key <= ord("9") and key - ord("1") < len(names):
+                selected = names[key - ord("1")]
+            elif key == ord("r") and selected in frames:
+                bbox = cv2.selectROI(
+                    "Select ROI", frames[selected], fromCenter=False, showCrosshair=True
+                )
+                cv2.destroyWindow("Select ROI")
+                if bbox and bbox[2] > 0 and bbox[3] > 0:
+                    orchestrator.select_roi(selected, bbox)
+                    orchestrator.set_tracking(selected, True)
+            elif key == ord("t"):
+                tracking = orchestrator.status()[selected]["tracking"]
+                orchestrator.set_tracking(selected, not tracking)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        orchestrator.stop()
+        if not headless:
+            cv2.destroyAllWindows()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Track several PTZ cameras at once.")
+    parser.add_argument(
+        "--camera",
+        action="append",
+        required=True,
+        type=CameraConfig.parse,
+        metavar="NAME=SOURCE[,PTZ_IP[:PORT]]",
+        help="camera to track; repeat for each camera",
+    )
+    parser.add_argument(
+        "--headless",
+        action="store_true",
+        help="log status instead of showing the preview window",
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
+    run(args.camera, args.headless)
+
+
+if __name__ == "__main__":
+    main()
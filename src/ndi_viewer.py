@@ -5,6 +5,11 @@ from PyQt5 import QtWidgets, QtGui, QtCore
 import numpy as np
 import cv2
 
+try:
+    from .audio_meter import AudioMeter
+except ImportError:  # run as a script from src/
+    from audio_meter import AudioMeter
+
 try:
     import NDIlib as ndi  # ndi-python module
 except ImportError:  # pragma: no cover - running without ndi-python installed
@@ -20,11 +25,13 @@ class NDIViewer(QtWidgets.QWidget):
         self.image_label = QtWidgets.QLabel(alignment=QtCore.Qt.AlignCenter)
         self.source_selector = QtWidgets.QComboBox()
         self.refresh_button = QtWidgets.QPushButton("Refresh")
+        self.level_label = QtWidgets.QLabel()
 
         layout = QtWidgets.QVBoxLayout(self)
         layout.addWidget(self.source_selector)
         layout.addWidget(self.refresh_button)
         layout.addWidget(self.image_label)
+        layout.addWidget(self.level_label)
 
         self.timer = QtCore.QTimer(self)
         self.timer.timeout.connect(self._update_frame)
@@ -34,6 +41,7 @@ class NDIViewer(QtWidgets.QWidget):
         self.finder = None
         self.receiver = None
         self.current_source = None
+        self.audio_meter = AudioMeter()
 
         if ndi is not None:
             if not ndi.initialize():
@@ -104,7 +112,15 @@ class NDIViewer(QtWidgets.QWidget):
             self.image_label.setPixmap(pix)
             ndi.recv_free_video_v2(self.receiver, video_frame)
         elif frame_type == ndi.FRAME_TYPE_AUDIO:
-            ndi.recv_free_audio_v2(self.receiver, audio_frame)
+            name = self.current_source.ndi_name
+            try:
+                self.audio_meter.update(name, audio_frame.data)
+            except Exception:
+                logging.exception("Failed to meter audio frame")
+            finally:
+                ndi.recv_free_audio_v2(self.receiver, audio_frame)
+            level = self.audio_meter.level_db(name)
+            self.level_label.setText(f"Audio {level:.0f} dBFS")
         elif frame_type == ndi.FRAME_TYPE_METADATA:
             ndi.recv_free_metadata(self.receiver, metadata_frame)
         elif frame_type == ndi.FRAME_TYPE_NONE:
@@ -5,6 +5,11 @@ import numpy as np
 import cv2
 from PySide6 import QtCore, QtGui, QtWidgets
 
+try:
+    from .audio_meter import AudioMeter
+except ImportError:  # run as a script from src/
+    from audio_meter import AudioMeter
+
 try:
     import NDIlib as ndi
 except ImportError:  # pragma: no cover - NDI may not be installed
@@ -25,6 +30,7 @@ class NDIViewer(QtWidgets.QMainWindow):
         self.refresh_btn = QtWidgets.QPushButton("Refresh")
         self.video_label = QtWidgets.QLabel(alignment=QtCore.Qt.AlignCenter)
         self.video_label.setMinimumSize(320, 240)
+        self.level_label = QtWidgets.QLabel()
 
         top_row = QtWidgets.QHBoxLayout()
         top_row.addWidget(self.combo)
@@ -35,6 +41,7 @@ class NDIViewer(QtWidgets.QMainWindow):
         layout.setSpacing(10)
         layout.addLayout(top_row)
         layout.addWidget(self.video_label)
+        layout.addWidget(self.level_label)
 
         self.timer = QtCore.QTimer(self)
         self.timer.timeout.connect(self._update_frame)
@@ -44,6 +51,8 @@ class NDIViewer(QtWidgets.QMainWindow):
         self.finder = None
         self.receiver = None
         self.sources = []
+        self.current_source = None
+        self.audio_meter = AudioMeter()
 
         if ndi is not None and ndi.initialize():
             self._refresh_sources()
@@ -117,6 +126,7 @@ class NDIViewer(QtWidgets.QMainWindow):
                 return
 
         ndi.recv_connect(self.receiver, source)
+        self.current_source = source
 
     def _update_frame(self):
         if self.receiver is None:
@@ -139,12 +149,17 @@ class NDIViewer(QtWidgets.QMainWindow):
                 ndi.recv_free_video_v2(self.receiver, video_frame)
                 break
             elif frame_type == ndi.FRAME_TYPE_AUDIO:
-                ndi.recv_free_audio_v2(self.receiver, audio_frame)
+                try:
+                    self.audio_meter.update(self.current_source.ndi_name, audio_frame.data)
+                except Exception:
+                    logging.exception("Failed to meter audio frame")
+                finally:
+                    ndi.recv_free_audio_v2(self.receiver, audio_frame)
                 continue
             elif frame_type == ndi.FRAME_TYPE_METADATA:
                 ndi.recv_free_metadata(self.receiver, metadata_frame)
                 continue
-            elif frame_type == ndi.FRANE_TYPE_STATUS_CHANGE:
+            elif frame_type == getattr(ndi, "FRAME_TYPE_STATUS_CHANGE", None):
                 continue
             elif frame_type == ndi.FRAME_TYPE_NONE:
                 break
@@ -152,6 +167,9 @@ class NDIViewer(QtWidgets.QMainWindow):
                 logging.warning("Unknown NDI frame type: %s", frame_type)
                 break
 
+        level = self.audio_meter.level_db(self.current_source.ndi_name)
+        self.level_label.setText(f"Audio {level:.0f} dBFS")
+
 
 def main():
     app = QtWidgets.QApplication(sys.argv)
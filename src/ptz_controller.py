@@ -1,3 +1,23 @@
+# VISCA memory numbers; 0xFF would read as the packet terminator
+MAX_PRESET = 0x7F
+
+
+def _check_preset(preset: int) -> int:
+    if not 0 <= preset <= MAX_PRESET:
+        raise ValueError(f"PTZ preset out of range 0-{MAX_PRESET}: {preset}")
+    return preset
+
+
+def parse_preset(spec: str):
+    """Parse ``SOURCE=PTZ_IP[:PORT]/PRESET`` into ``(source, (ip, port, preset))``."""
+    source, sep, target = spec.rpartition("=")
+    address, slash, preset = target.rpartition("/")
+    if not sep or not source or not slash or not address:
+        raise ValueError(f"Invalid preset spec: {spec!r}")
+    ip, _, port = address.partition(":")
+    return source, (ip, int(port) if port else 52381, _check_preset(int(preset)))
+
+
 class PTZController:
     """Simple VISCA-over-IP controller for PTZ cameras."""
     def __init__(self, ip: str, port: int = 52381):
@@ -37,5 +57,23 @@ class PTZController:
         except OSError:
             pass
 
+    def follow(self, cx: float, cy: float, fw: int, fh: int, gain: int = 10) -> None:
+        """Steer the camera so that point ``(cx, cy)`` moves to the frame centre.
+
+        The offset from the centre of a ``fw`` x ``fh`` frame is scaled by
+        ``gain`` into pan/tilt speeds.
+        """
+        offset_x = (cx - fw / 2) / (fw / 2)
+        offset_y = (cy - fh / 2) / (fh / 2)
+        self.pan_tilt(int(offset_x * gain), int(offset_y * -gain))
+
+    def recall_preset(self, preset: int) -> None:
+        """Move the camera to memory ``preset`` (0-127)."""
+        cmd = bytes([0x81, 0x01, 0x04, 0x3F, 0x02, _check_preset(preset), 0xFF])
+        try:
+            self.sock.sendto(cmd, self.address)
+        except OSError:
+            pass
+
     def close(self) -> None:
         self.sock.close()
@@ -67,11 +67,7 @@ class VideoTracker:
         self.root.after(10, self.update)
 
     def send_ptz(self, cx, cy, fw, fh):
-        offset_x = (cx - fw / 2) / (fw / 2)
-        offset_y = (cy - fh / 2) / (fh / 2)
-        pan_speed = int(offset_x * 10)
-        tilt_speed = int(offset_y * -10)
-        self.ptz.pan_tilt(pan_speed, tilt_speed)
+        self.ptz.follow(cx, cy, fw, fh)
 
     def run(self):
         self.update()
@@ -11,11 +11,11 @@ if exist "venv310\Scripts\activate.bat" (
     echo Virtual environment not found. Expected venv310 directory.
 )
 
-rem Set PYTHONPATH to the src directory
-set "PYTHONPATH=%CD%\src"
+rem Set PYTHONPATH to the project root
+set "PYTHONPATH=%CD%"
 
 rem Launch the application
-python -m gui.main_window
+python -m src.main viewer
 
 popd
 